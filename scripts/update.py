@@ -1,17 +1,60 @@
 import asyncio
+import functools
+import heapq
 import json
 import os
 import re
-import time
-from dataclasses import dataclass
+import ssl
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from enum import IntEnum
 from pathlib import Path
-from typing import Iterable, Literal
+from typing import Awaitable, Callable, Iterable, Literal, TypeVar
+from urllib.parse import urlsplit
 
 import aiohttp
 from aiohttp_socks import ProxyConnector
+from python_socks import ProxyError, ProxyTimeoutError
+from python_socks.async_.asyncio import Proxy as SocksProxy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # optional, Linux-only speedup
+    uvloop = None
+
+# asyncio.timeout() and asyncio.TaskGroup are 3.11+; fail up front rather than mid-run.
+if sys.version_info < (3, 11):
+    raise SystemExit("scripts/update.py requires Python 3.11 or newer.")
 
 ProxyType = Literal["http", "socks4", "socks5"]
+T = TypeVar("T")
+
+
+class SrcType(IntEnum):
+    """Which candidate pool a source feeds. HTTP, HTTPS and mixed lists all go to FORWARD."""
+
+    FORWARD = 0
+    SOCKS4 = 1
+    SOCKS5 = 2
+
+
+SOURCE_TYPES: dict[str, SrcType] = {
+    "http": SrcType.FORWARD,
+    "https": SrcType.FORWARD,
+    "mixed": SrcType.FORWARD,
+    "socks4": SrcType.SOCKS4,
+    "socks5": SrcType.SOCKS5,
+}
+
+# IPv4 address and port packed as (ip << 16) | port: cheaper to hash and compare than a
+# "host:port" string, and only unpacked once a Proxy is built.
+Candidate = int
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -23,39 +66,93 @@ DEFAULT_TIMEOUT_SEC = float(os.getenv("PROXY_TIMEOUT_SEC", "8"))
 CONCURRENCY = int(os.getenv("PROXY_CONCURRENCY", "200"))
 MAX_PER_TYPE = int(os.getenv("PROXY_MAX_PER_TYPE", "2000"))
 TOP_HTTP_LIMIT = int(os.getenv("PROXY_TOP_HTTP_LIMIT", "100"))
+SCRAPE_CONCURRENCY = 20
+SCRAPE_TIMEOUT = aiohttp.ClientTimeout(total=30)
 
 # You can override these via environment variables if you prefer other targets.
 TEST_URL_HTTPS = os.getenv("PROXY_TEST_URL_HTTPS", "https://api.ipify.org?format=json")
-TEST_URL_HTTP = os.getenv("PROXY_TEST_URL_HTTP", "http://api.ipify.org?format=json")
-
-PROXY_RE = re.compile(r"^\s*(?P<host>\d{1,3}(?:\.\d{1,3}){3})\s*:\s*(?P<port>\d{2,5})\s*$")
-
-
-@dataclass(frozen=True)
+# The HTTP target is a bodiless 204 endpoint; checks send HEAD and only look at the status.
+TEST_URL_HTTP = os.getenv("PROXY_TEST_URL_HTTP", "http://cp.cloudflare.com/generate_204")
+
+
+@functools.cache
+def expected_status(url: str) -> tuple[int, ...]:
+    # A generate_204 endpoint only ever answers 204, so a 200 there comes from something that
+    # isn't relaying (e.g. a plain web server on the proxy's port) and must not count.
+    return (204,) if urlsplit(url).path.endswith("/generate_204") else (200, 204)
+
+
+PROBE_OK_STATUS = expected_status(TEST_URL_HTTP)
+
+# Forward proxies are validated over raw sockets: a hand-written HTTP/1.0 HEAD for TEST_URL_HTTP
+# decides http.txt and a CONNECT to TEST_URL_HTTPS's host decides https.txt. PROXY_AIOHTTP_PROBE=1
+# switches to the aiohttp-based check, which sends a single HTTPS request (exercising CONNECT)
+# and counts it for both lists; PROXY_DUAL_PROBE=1 additionally tests each scheme separately.
+AIOHTTP_PROBE = os.getenv("PROXY_AIOHTTP_PROBE", "0") == "1"
+DUAL_PROBE = os.getenv("PROXY_DUAL_PROBE", "0") == "1"
+
+# SOCKS proxies are validated by the handshake alone (CONNECT to the HTTP test host).
+# Set PROXY_SOCKS_HTTP_PROBE=1 to run a full HTTP(S) request through each proxy instead.
+SOCKS_HTTP_PROBE = os.getenv("PROXY_SOCKS_HTTP_PROBE", "0") == "1"
+_probe_url = urlsplit(TEST_URL_HTTP)
+SOCKS_PROBE_HOST = _probe_url.hostname or "cp.cloudflare.com"
+SOCKS_PROBE_PORT = _probe_url.port or 80
+
+RAW_PROBE_REQUEST = (
+    f"HEAD {TEST_URL_HTTP} HTTP/1.0\r\n"
+    f"Host: {_probe_url.netloc}\r\n"
+    "User-Agent: free-proxy-list-bot/1.0\r\n"
+    "\r\n"
+).encode("ascii")
+
+_connect_url = urlsplit(TEST_URL_HTTPS)
+CONNECT_HOST = _connect_url.hostname or "api.ipify.org"
+_connect_target = f"{CONNECT_HOST}:{_connect_url.port or 443}"
+# A 200 to CONNECT proves nothing on its own (anything can answer 200), so the raw HTTPS probe
+# also completes a verified TLS handshake with CONNECT_HOST through the tunnel.
+CONNECT_TLS_CONTEXT = ssl.create_default_context()
+RAW_CONNECT_REQUEST = (
+    f"CONNECT {_connect_target} HTTP/1.1\r\n"
+    f"Host: {_connect_target}\r\n"
+    "User-Agent: free-proxy-list-bot/1.0\r\n"
+    "\r\n"
+).encode("ascii")
+
+# Anchored per line (MULTILINE) so one finditer() over the raw body picks out every
+# "host:port" line; comments and other junk simply don't match. Group 1 is the host,
+# group 2 the port.
+PROXY_RE = re.compile(
+    rb"^[ \t]*(\d{1,3}(?:\.\d{1,3}){3})[ \t]*:[ \t]*(\d{2,5})[ \t\r]*$",
+    re.MULTILINE,
+)
+
+# What a dead or misbehaving proxy is expected to raise. Anything else is a bug and
+# should surface rather than be counted as a failed proxy.
+PROBE_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError, OSError)
+
+
+@dataclass(frozen=True, slots=True)
 class Proxy:
     type: ProxyType
     host: str
     port: int
+    # Read on every check, so computed once here rather than in properties.
+    hostport: str = field(init=False, repr=False, compare=False)
+    url: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def hostport(self) -> str:
-        return f"{self.host}:{self.port}"
-
-    @property
-    def url(self) -> str:
-        if self.type in ("http", "https"):
-            return f"http://{self.host}:{self.port}"
-        if self.type == "socks4":
-            return f"socks4://{self.host}:{self.port}"
-        return f"socks5://{self.host}:{self.port}"
+    def __post_init__(self) -> None:
+        hostport = f"{self.host}:{self.port}"
+        scheme = "http" if self.type in ("http", "https") else self.type
+        object.__setattr__(self, "hostport", hostport)
+        object.__setattr__(self, "url", f"{scheme}://{hostport}")
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def read_sources(path: Path) -> list[tuple[str, str]]:
-    items: list[tuple[str, str]] = []
+def read_sources(path: Path) -> list[tuple[str, SrcType]]:
+    items: list[tuple[str, SrcType]] = []
     for raw in path.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
         if not line or line.startswith("#"):
@@ -63,57 +160,55 @@ def read_sources(path: Path) -> list[tuple[str, str]]:
         parts = line.split()
         url = parts[0]
         typ = parts[1].lower() if len(parts) > 1 else "mixed"
-        items.append((url, typ))
+        if typ not in SOURCE_TYPES:
+            raise ValueError(f"{path}: unknown source type {typ!r} for {url}")
+        items.append((url, SOURCE_TYPES[typ]))
     return items
 
 
-def parse_candidates(text: str) -> list[str]:
-    out: list[str] = []
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        m = PROXY_RE.match(line)
-        if not m:
-            continue
-        host = m.group("host")
-        port = int(m.group("port"))
-        if 1 <= port <= 65535:
-            out.append(f"{host}:{port}")
+def parse_candidates(text: bytes) -> set[Candidate]:
+    out: set[Candidate] = set()
+    for m in PROXY_RE.finditer(text):
+        a, b, c, d = map(int, m.group(1).split(b"."))
+        port = int(m.group(2))
+        # Out-of-range octets would bleed into their neighbours once packed.
+        if a <= 255 and b <= 255 and c <= 255 and d <= 255 and 1 <= port <= 65535:
+            out.add((a << 40) | (b << 32) | (c << 24) | (d << 16) | port)
     return out
 
 
-async def fetch_text(session: aiohttp.ClientSession, url: str) -> str:
+async def fetch_text(session: aiohttp.ClientSession, url: str) -> bytes:
     async with session.get(
         url,
         headers={"User-Agent": "free-proxy-list-bot/1.0"},
         allow_redirects=True,
+        timeout=SCRAPE_TIMEOUT,
     ) as resp:
         resp.raise_for_status()
-        return await resp.text(errors="ignore")
+        return await resp.read()
 
 
-async def scrape_all_sources() -> dict[str, set[str]]:
+async def scrape_all_sources(session: aiohttp.ClientSession) -> dict[SrcType, set[Candidate]]:
     sources = read_sources(SOURCES_FILE)
-    timeout = aiohttp.ClientTimeout(total=30)
-    connector = aiohttp.TCPConnector(ssl=False, limit=20)
-    results: dict[str, set[str]] = {"forward": set(), "socks4": set(), "socks5": set()}
-
-    async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=True) as session:
-        tasks = []
-        for url, typ in sources:
-            tasks.append((url, typ, asyncio.create_task(fetch_text(session, url))))
+    sem = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    results: dict[SrcType, set[Candidate]] = {typ: set() for typ in SrcType}
 
-        for url, typ, task in tasks:
-            try:
-                text = await task
-            except Exception:
-                continue
-            candidates = parse_candidates(text)
-            if typ in ("http", "https", "mixed"):
-                results["forward"].update(candidates)
-            elif typ in results:
-                results[typ].update(candidates)
+    async def fetch_and_parse(url: str, typ: SrcType) -> tuple[SrcType, set[Candidate]]:
+        # Only a failed download skips the source; a parser error is a bug and must fail the run
+        # rather than quietly publish empty lists.
+        try:
+            async with sem:
+                text = await fetch_text(session, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return typ, set()
+        # Parsed inline: the scan holds the GIL either way, and a worker thread measured no
+        # faster than running it on the loop once the download is done.
+        return typ, parse_candidates(text)
+
+    # Merge each source as soon as it is ready instead of waiting on slower ones listed earlier.
+    for fut in asyncio.as_completed([fetch_and_parse(url, typ) for url, typ in sources]):
+        typ, candidates = await fut
+        results[typ] |= candidates
     return results
 
 
@@ -123,93 +218,225 @@ async def _check_via_proxy(
     url: str,
     proxy_url: str | None,
 ) -> bool:
-    async with session.get(url, proxy=proxy_url) as resp:
-        if resp.status >= 400:
-            return False
-        await resp.read()
-        return True
+    async with session.head(url, proxy=proxy_url, allow_redirects=False) as resp:
+        return resp.status in expected_status(url)
 
 
-async def check_forward_proxy(proxy: Proxy, timeout_s: float) -> tuple[float | None, float | None]:
+async def check_forward_proxy(
+    session: aiohttp.ClientSession, proxy: Proxy, timeout_s: float
+) -> tuple[float | None, float | None]:
     """
     Returns (http_ms, https_ms). Either can be None if that protocol test fails.
-    """
-    timeout = aiohttp.ClientTimeout(total=timeout_s)
-    connector = aiohttp.TCPConnector(ssl=False)
-    async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=True) as session:
-        http_ms: float | None = None
-        https_ms: float | None = None
 
-        start = time.perf_counter()
-        try:
-            ok = await _check_via_proxy(session, url=TEST_URL_HTTP, proxy_url=proxy.url)
-            if ok:
-                http_ms = (time.perf_counter() - start) * 1000.0
-        except Exception:
-            pass
+    The session is shared across the whole validation pass; the proxy is selected
+    per request via the `proxy=` kwarg. Unless DUAL_PROBE is set, only the HTTPS
+    test runs and its result is reported for both schemes.
+    """
+    if DUAL_PROBE:
+        return await _check_forward_dual(session, proxy, timeout_s)
 
-        start = time.perf_counter()
-        try:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        async with asyncio.timeout(timeout_s):
             ok = await _check_via_proxy(session, url=TEST_URL_HTTPS, proxy_url=proxy.url)
-            if ok:
-                https_ms = (time.perf_counter() - start) * 1000.0
-        except Exception:
-            pass
+    except PROBE_ERRORS:
+        return None, None
+    if not ok:
+        return None, None
+    ms = (loop.time() - start) * 1000.0
+    return ms, ms
 
-        return http_ms, https_ms
+
+def _status_in(status_line: bytes, ok_status: tuple[int, ...]) -> bool:
+    parts = status_line.split(None, 2)
+    return len(parts) >= 2 and parts[1].isdigit() and int(parts[1]) in ok_status
+
+
+async def _raw_probe(
+    host: str,
+    port: int,
+    request: bytes,
+    ok_status: tuple[int, ...],
+    timeout_s: float,
+    *,
+    tls_server_hostname: str | None = None,
+) -> float | None:
+    """
+    Sends `request` straight to the proxy and returns the elapsed ms if the status line
+    carries one of `ok_status`, without going through aiohttp at all. With
+    `tls_server_hostname`, the connection is then treated as a tunnel and a TLS handshake
+    with that host must also succeed through it.
+    """
+    writer: asyncio.StreamWriter | None = None
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        async with asyncio.timeout(timeout_s):
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            if not _status_in(await reader.readline(), ok_status):
+                return None
+            if tls_server_hostname is not None:
+                # Skip the rest of the CONNECT reply headers; the tunnel starts after them.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                await writer.start_tls(CONNECT_TLS_CONTEXT, server_hostname=tls_server_hostname)
+    # ValueError: a line over the stream limit. ssl.SSLError is an OSError subclass.
+    except (*PROBE_ERRORS, ValueError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+    return (loop.time() - start) * 1000.0
+
+
+async def probe_http_proxy(host: str, port: int, timeout_s: float) -> float | None:
+    return await _raw_probe(host, port, RAW_PROBE_REQUEST, PROBE_OK_STATUS, timeout_s)
+
+
+async def probe_connect_proxy(host: str, port: int, timeout_s: float) -> float | None:
+    return await _raw_probe(
+        host, port, RAW_CONNECT_REQUEST, (200,), timeout_s, tls_server_hostname=CONNECT_HOST
+    )
+
+
+async def check_forward_raw(proxy: Proxy, timeout_s: float) -> tuple[float | None, float | None]:
+    http_ms, https_ms = await asyncio.gather(
+        probe_http_proxy(proxy.host, proxy.port, timeout_s),
+        probe_connect_proxy(proxy.host, proxy.port, timeout_s),
+    )
+    return http_ms, https_ms
+
+
+async def _timed_check_via_proxy(session: aiohttp.ClientSession, url: str, proxy: Proxy) -> float | None:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        ok = await _check_via_proxy(session, url=url, proxy_url=proxy.url)
+    except (aiohttp.ClientError, OSError):
+        return None
+    return (loop.time() - start) * 1000.0 if ok else None
+
+
+async def _check_forward_dual(
+    session: aiohttp.ClientSession, proxy: Proxy, timeout_s: float
+) -> tuple[float | None, float | None]:
+    http_ms: float | None = None
+    https_ms: float | None = None
+
+    # Both probes share one deadline, so a dead proxy gives up its semaphore slot after
+    # timeout_s in total instead of once per probe.
+    try:
+        async with asyncio.timeout(timeout_s):
+            http_ms = await _timed_check_via_proxy(session, TEST_URL_HTTP, proxy)
+            https_ms = await _timed_check_via_proxy(session, TEST_URL_HTTPS, proxy)
+    except asyncio.TimeoutError:
+        pass
+
+    return http_ms, https_ms
 
 
 async def check_socks(proxy: Proxy, timeout_s: float) -> float | None:
+    # ProxyConnector is bound to a single proxy URL, so SOCKS checks still need one
+    # session per proxy. Keep it as light as possible: no SSL context, no env scanning.
     timeout = aiohttp.ClientTimeout(total=timeout_s)
-    connector = ProxyConnector.from_url(proxy.url, rdns=True)
-    async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=True) as session:
-        start = time.perf_counter()
+    connector = ProxyConnector.from_url(proxy.url, rdns=True, ssl=False)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=False) as session:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
         for url in (TEST_URL_HTTPS, TEST_URL_HTTP):
             try:
-                async with session.get(url) as resp:
-                    if resp.status >= 400:
+                async with session.head(url, allow_redirects=False) as resp:
+                    if resp.status not in expected_status(url):
                         continue
-                    await resp.read()
-                    return (time.perf_counter() - start) * 1000.0
+                    return (loop.time() - start) * 1000.0
             except Exception:
                 continue
     return None
 
 
+async def check_socks_fast(proxy: Proxy, timeout_s: float) -> float | None:
+    """
+    Returns the SOCKS handshake time in ms, or None if the proxy could not open a
+    tunnel to the probe host. No HTTP request is sent.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        async with asyncio.timeout(timeout_s):
+            sock = await SocksProxy.from_url(proxy.url, rdns=True).connect(
+                dest_host=SOCKS_PROBE_HOST, dest_port=SOCKS_PROBE_PORT, timeout=timeout_s
+            )
+    # ProxyTimeoutError is a bare Exception subclass, not a TimeoutError or ProxyError, and a
+    # truncated reply surfaces as ValueError from python_socks' address decoding.
+    except (*PROBE_ERRORS, ProxyError, ProxyTimeoutError, ValueError):
+        return None
+    ms = (loop.time() - start) * 1000.0
+    sock.close()
+    return ms
+
+
+async def run_pool(items: Iterable[T], fn: Callable[[T], Awaitable[None]], concurrency: int) -> None:
+    """
+    Runs `fn` over `items` with a fixed pool of `concurrency` workers pulling from one
+    shared iterator, so only that many tasks and coroutine frames exist at any time
+    instead of one per item.
+    """
+    it = iter(items)
+
+    async def worker() -> None:
+        for item in it:
+            await fn(item)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(concurrency):
+            tg.create_task(worker())
+
+
 async def validate_socks(proxies: Iterable[Proxy], timeout_s: float, concurrency: int) -> list[tuple[Proxy, float]]:
-    sem = asyncio.Semaphore(concurrency)
     ok: list[tuple[Proxy, float]] = []
+    check = check_socks if SOCKS_HTTP_PROBE else check_socks_fast
 
     async def run_one(p: Proxy) -> None:
-        async with sem:
-            ms = await check_socks(p, timeout_s)
-            if ms is not None:
-                ok.append((p, ms))
+        ms = await check(p, timeout_s)
+        if ms is not None:
+            ok.append((p, ms))
 
-    await asyncio.gather(*(run_one(p) for p in proxies))
+    await run_pool(proxies, run_one, concurrency)
     ok.sort(key=lambda x: x[1])
     return ok
 
 
+ForwardCheck = Callable[[Proxy, float], Awaitable[tuple[float | None, float | None]]]
+
+
 async def validate_forward(
-    proxies: Iterable[Proxy], timeout_s: float, concurrency: int
+    session: aiohttp.ClientSession, proxies: Iterable[Proxy], timeout_s: float, concurrency: int
 ) -> tuple[list[str], list[str], dict[str, dict[str, int]]]:
     """
     Returns (http_working, https_working, counts_by_capability).
+
+    `session` is only used by the aiohttp-based check; the default raw probe opens
+    its own sockets.
     """
-    sem = asyncio.Semaphore(concurrency)
     http_ok: list[tuple[str, float]] = []
     https_ok: list[tuple[str, float]] = []
+    check: ForwardCheck
+    if AIOHTTP_PROBE or DUAL_PROBE:
+        check = functools.partial(check_forward_proxy, session)
+    else:
+        check = check_forward_raw
 
     async def run_one(p: Proxy) -> None:
-        async with sem:
-            http_ms, https_ms = await check_forward_proxy(p, timeout_s)
-            if http_ms is not None:
-                http_ok.append((p.hostport, http_ms))
-            if https_ms is not None:
-                https_ok.append((p.hostport, https_ms))
-
-    await asyncio.gather(*(run_one(p) for p in proxies))
+        http_ms, https_ms = await check(p, timeout_s)
+        if http_ms is not None:
+            http_ok.append((p.hostport, http_ms))
+        if https_ms is not None:
+            https_ok.append((p.hostport, https_ms))
+
+    await run_pool(proxies, run_one, concurrency)
     http_ok.sort(key=lambda x: x[1])
     https_ok.sort(key=lambda x: x[1])
     return [hp for hp, _ in http_ok], [hp for hp, _ in https_ok], {
@@ -218,11 +445,12 @@ async def validate_forward(
     }
 
 
-def to_proxies(proxy_type: ProxyType, hostports: Iterable[str]) -> list[Proxy]:
+def to_proxies(proxy_type: ProxyType, candidates: Iterable[Candidate]) -> list[Proxy]:
     out: list[Proxy] = []
-    for hp in hostports:
-        host, port_s = hp.split(":", 1)
-        out.append(Proxy(type=proxy_type, host=host, port=int(port_s)))
+    for key in candidates:
+        ip = key >> 16
+        host = f"{(ip >> 24) & 255}.{(ip >> 16) & 255}.{(ip >> 8) & 255}.{ip & 255}"
+        out.append(Proxy(type=proxy_type, host=host, port=key & 0xFFFF))
     return out
 
 
@@ -258,46 +486,66 @@ def update_readme_stats(stats: dict) -> None:
     README.write_text(new_text, encoding="utf-8")
 
 
+def dump_json(obj: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+
+
+def _flush_all(out_dir: Path, lists: dict[str, list[str]], stats: dict) -> None:
+    """
+    Writes every output file (proxy lists, summary.json, README stats) in one go, so
+    main() can push all of the blocking disk I/O to a single worker thread.
+    """
+    for name, hostports in lists.items():
+        write_txt(out_dir / name, hostports)
+    (out_dir / "summary.json").write_bytes(dump_json(stats))
+    update_readme_stats(stats)
+
+
 async def main() -> None:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    scraped = await scrape_all_sources()
+    # One connector (pool + DNS cache) shared by source scraping and forward validation.
+    # No per-host limit: all sources may live on the same host (e.g. raw.githubusercontent.com).
+    timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SEC)
+    connector = aiohttp.TCPConnector(
+        ssl=False, limit=CONCURRENCY, ttl_dns_cache=600, use_dns_cache=True, enable_cleanup_closed=True
+    )
+    session = aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=True)
+    async with session:
+        scraped = await scrape_all_sources(session)
 
-    # Cap candidates to keep runtime stable.
-    forward_candidates = sorted(scraped["forward"])[:MAX_PER_TYPE]
-    socks4_candidates = sorted(scraped["socks4"])[:MAX_PER_TYPE]
-    socks5_candidates = sorted(scraped["socks5"])[:MAX_PER_TYPE]
+        # Cap candidates to keep runtime stable.
+        forward_candidates = heapq.nsmallest(MAX_PER_TYPE, scraped[SrcType.FORWARD])
+        socks4_candidates = heapq.nsmallest(MAX_PER_TYPE, scraped[SrcType.SOCKS4])
+        socks5_candidates = heapq.nsmallest(MAX_PER_TYPE, scraped[SrcType.SOCKS5])
 
-    forward_proxies = to_proxies("http", forward_candidates)
-    socks4_proxies = to_proxies("socks4", socks4_candidates)
-    socks5_proxies = to_proxies("socks5", socks5_candidates)
+        forward_proxies = to_proxies("http", forward_candidates)
+        socks4_proxies = to_proxies("socks4", socks4_candidates)
+        socks5_proxies = to_proxies("socks5", socks5_candidates)
+
+        forward_http, forward_https, _forward_counts = await validate_forward(
+            session, forward_proxies, DEFAULT_TIMEOUT_SEC, CONCURRENCY
+        )
 
-    forward_http, forward_https, _forward_counts = await validate_forward(
-        forward_proxies, DEFAULT_TIMEOUT_SEC, CONCURRENCY
-    )
     socks4_ok = await validate_socks(socks4_proxies, DEFAULT_TIMEOUT_SEC, CONCURRENCY)
     socks5_ok = await validate_socks(socks5_proxies, DEFAULT_TIMEOUT_SEC, CONCURRENCY)
 
     socks4_working = [p.hostport for p, _ms in socks4_ok]
     socks5_working = [p.hostport for p, _ms in socks5_ok]
 
-    # Fallback: if no proxy explicitly passed the HTTPS test but we have HTTP-working proxies,
-    # expose the HTTP list as HTTPS candidates as well. In practice most HTTP forward proxies
-    # support HTTPS via CONNECT, and this avoids an empty https.txt which is confusing for users.
-    if not forward_https and forward_http:
+    # Fallback (dual-probe mode only): if no proxy explicitly passed the HTTPS test but we have
+    # HTTP-working proxies, expose the HTTP list as HTTPS candidates as well. In practice most
+    # HTTP forward proxies support HTTPS via CONNECT, and this avoids an empty https.txt which
+    # is confusing for users. The single-probe default already fills both lists.
+    if DUAL_PROBE and not forward_https and forward_http:
         forward_https = list(forward_http)
 
     all_working = sorted(set(forward_http) | set(forward_https) | set(socks4_working) | set(socks5_working))
 
-    write_txt(OUT_DIR / "http.txt", forward_http)
-    write_txt(OUT_DIR / "https.txt", forward_https)
-    write_txt(OUT_DIR / "socks4.txt", socks4_working)
-    write_txt(OUT_DIR / "socks5.txt", socks5_working)
-    write_txt(OUT_DIR / "all.txt", all_working)
-
     # Also expose a small subset of the fastest HTTP proxies for convenience.
     top_http = forward_http[:TOP_HTTP_LIMIT] if forward_http else []
-    write_txt(OUT_DIR / "top-http.txt", top_http)
 
     stats = {
         "updated_utc": utc_now_iso(),
@@ -319,10 +567,19 @@ async def main() -> None:
             },
         },
     }
-    (OUT_DIR / "summary.json").write_text(json.dumps(stats, indent=2, sort_keys=True), encoding="utf-8")
-    update_readme_stats(stats)
+    lists = {
+        "http.txt": forward_http,
+        "https.txt": forward_https,
+        "socks4.txt": socks4_working,
+        "socks5.txt": socks5_working,
+        "all.txt": all_working,
+        "top-http.txt": top_http,
+    }
+    await asyncio.to_thread(_flush_all, OUT_DIR, lists, stats)
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
 
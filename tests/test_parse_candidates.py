@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import update  # noqa: E402
+
+
+def hostports(candidates):
+    return sorted(p.hostport for p in update.to_proxies("http", candidates))
+
+
+def test_parse_candidates():
+    text = (
+        b"# comment 9.9.9.9:80\n"
+        b"1.2.3.4:8080\r\n"
+        b"  5.6.7.8 : 3128  \n"
+        b"\n"
+        b"not a proxy\n"
+        b"10.0.0.1:80 trailing junk\n"
+        b"1.2.3.4:8080\n"
+        b"255.255.255.255:65535"
+    )
+    assert hostports(update.parse_candidates(text)) == [
+        "1.2.3.4:8080",
+        "255.255.255.255:65535",
+        "5.6.7.8:3128",
+    ]
+
+
+def test_parse_candidates_rejects_out_of_range():
+    text = b"999.1.1.1:80\n1.2.3.4:99999\n1.2.3.4:0\n01.02.03.04:80\n"
+    assert hostports(update.parse_candidates(text)) == ["1.2.3.4:80"]
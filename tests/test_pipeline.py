@@ -0,0 +1,109 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import update  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("http://cp.cloudflare.com/generate_204", (204,)),
+        ("http://connectivitycheck.gstatic.com/generate_204", (204,)),
+        ("http://api.ipify.org?format=json", (200, 204)),
+        ("https://api.ipify.org?format=json", (200, 204)),
+    ],
+)
+def test_expected_status(url, expected):
+    assert update.expected_status(url) == expected
+
+
+def test_read_sources(tmp_path):
+    path = tmp_path / "sources.txt"
+    path.write_text(
+        "# comment\n"
+        "\n"
+        "https://a.example/http.txt http\n"
+        "https://a.example/https.txt HTTPS\n"
+        "https://a.example/socks4.txt socks4\n"
+        "https://a.example/socks5.txt socks5\n"
+        "https://a.example/any.txt\n",
+        encoding="utf-8",
+    )
+    assert update.read_sources(path) == [
+        ("https://a.example/http.txt", update.SrcType.FORWARD),
+        ("https://a.example/https.txt", update.SrcType.FORWARD),
+        ("https://a.example/socks4.txt", update.SrcType.SOCKS4),
+        ("https://a.example/socks5.txt", update.SrcType.SOCKS5),
+        ("https://a.example/any.txt", update.SrcType.FORWARD),
+    ]
+
+
+def test_read_sources_rejects_unknown_type(tmp_path):
+    path = tmp_path / "sources.txt"
+    path.write_text("https://a.example/list.txt sock5\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="sock5"):
+        update.read_sources(path)
+
+
+def test_repo_sources_file_is_valid():
+    assert update.read_sources(update.SOURCES_FILE)
+
+
+def test_to_proxies_unpacks_candidates():
+    candidates = update.parse_candidates(b"0.0.0.1:10\n10.20.30.40:8080\n255.255.255.255:65535\n")
+    proxies = update.to_proxies("socks5", sorted(candidates))
+    assert [(p.host, p.port) for p in proxies] == [
+        ("0.0.0.1", 10),
+        ("10.20.30.40", 8080),
+        ("255.255.255.255", 65535),
+    ]
+    assert proxies[1].url == "socks5://10.20.30.40:8080"
+    assert proxies[1] == update.Proxy(type="socks5", host="10.20.30.40", port=8080)
+
+
+def test_run_pool_processes_every_item_within_concurrency():
+    seen = []
+    active = 0
+    peak = 0
+
+    async def fn(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        seen.append(item)
+        active -= 1
+
+    asyncio.run(update.run_pool(range(50), fn, 4))
+    assert sorted(seen) == list(range(50))
+    assert peak == 4
+
+
+def test_run_pool_handles_fewer_items_than_workers():
+    seen = []
+
+    async def fn(item):
+        seen.append(item)
+
+    asyncio.run(update.run_pool([1, 2], fn, 10))
+    assert sorted(seen) == [1, 2]
+
+
+def test_run_pool_propagates_worker_errors_and_stops():
+    seen = []
+
+    async def fn(item):
+        if item == 3:
+            raise RuntimeError("boom")
+        seen.append(item)
+        await asyncio.sleep(0)
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        asyncio.run(update.run_pool(range(100), fn, 2))
+    assert excinfo.group_contains(RuntimeError, match="boom")
+    assert len(seen) < 99
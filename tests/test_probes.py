@@ -0,0 +1,174 @@
+import asyncio
+import contextlib
+import ssl
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import update  # noqa: E402
+
+
+@contextlib.asynccontextmanager
+async def fake_server(handler):
+    """Runs `handler(reader, writer)` on a local port and yields that port."""
+
+    async def wrapped(reader, writer):
+        try:
+            await handler(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(wrapped, "127.0.0.1", 0)
+    async with server:
+        yield server.sockets[0].getsockname()[1]
+
+
+async def truncated_socks5(reader, writer):
+    await reader.readexactly(3)  # greeting: VER, NMETHODS, METHOD
+    writer.write(b"\x05\x00")
+    await writer.drain()
+    await reader.read(1024)  # connect request
+    # IPv4 bind address cut short: 2 bytes instead of 4 + port.
+    writer.write(b"\x05\x00\x00\x01\x01\x02")
+    await writer.drain()
+
+
+def test_check_socks_fast_survives_truncated_reply():
+    async def run():
+        async with fake_server(truncated_socks5) as port:
+            proxy = update.Proxy(type="socks5", host="127.0.0.1", port=port)
+            assert await update.check_socks_fast(proxy, 2) is None
+            assert await update.validate_socks([proxy] * 3, 2, 2) == []
+
+    asyncio.run(run())
+
+
+CERT = Path(__file__).resolve().parent / "localhost.pem"
+
+
+def trust_local_cert(monkeypatch):
+    ctx = ssl.create_default_context(cafile=str(CERT))
+    monkeypatch.setattr(update, "CONNECT_TLS_CONTEXT", ctx)
+    monkeypatch.setattr(update, "CONNECT_HOST", "localhost")
+
+
+async def always_200(reader, writer):
+    await reader.readline()
+    writer.write(b"HTTP/1.1 200 OK\r\n\r\n")
+    await writer.drain()
+
+
+async def tunnelling_proxy(reader, writer):
+    """Answers CONNECT with 200 and then terminates TLS itself, as if it were the target."""
+    line = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    if not line.startswith(b"CONNECT "):
+        writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+        await writer.drain()
+        return
+    writer.write(b"HTTP/1.1 200 Connection established\r\nProxy-Agent: test\r\n\r\n")
+    await writer.drain()
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(str(CERT))
+    await writer.start_tls(server_ctx)
+
+
+def test_connect_probe_requires_tls_through_tunnel(monkeypatch):
+    trust_local_cert(monkeypatch)
+
+    async def run():
+        async with fake_server(tunnelling_proxy) as port:
+            proxy = update.Proxy(type="http", host="127.0.0.1", port=port)
+            http_ms, https_ms = await update.check_forward_raw(proxy, 2)
+            assert http_ms is not None and https_ms is not None
+
+    asyncio.run(run())
+
+
+def test_server_answering_200_to_everything_is_not_a_proxy(monkeypatch):
+    trust_local_cert(monkeypatch)
+
+    async def run():
+        async with fake_server(always_200) as port:
+            proxy = update.Proxy(type="http", host="127.0.0.1", port=port)
+            assert await update.check_forward_raw(proxy, 2) == (None, None)
+
+    asyncio.run(run())
+
+
+def replying(status_line):
+    async def handler(reader, writer):
+        await reader.readline()
+        writer.write(status_line)
+        await writer.drain()
+
+    return handler
+
+
+@pytest.mark.parametrize(
+    "status_line, ok",
+    [
+        (b"HTTP/1.1 204 No Content\r\n", True),
+        (b"HTTP/1.0 204\r\n", True),
+        (b"HTTP/1.1 200 OK\r\n", False),
+        (b"HTTP/1.1 2040 Nope\r\n", False),
+        (b"HTTP/1.1 abc\r\n", False),
+        (b"garbage\r\n", False),
+        (b"", False),
+    ],
+)
+def test_raw_probe_status_line(status_line, ok):
+    async def run():
+        async with fake_server(replying(status_line)) as port:
+            return await update._raw_probe("127.0.0.1", port, b"HEAD / HTTP/1.0\r\n\r\n", (204,), 2)
+
+    assert (asyncio.run(run()) is not None) is ok
+
+
+def test_raw_probe_rejects_oversized_status_line():
+    async def run():
+        async with fake_server(replying(b"HTTP/1.1 204 " + b"x" * 100_000 + b"\r\n")) as port:
+            return await update._raw_probe("127.0.0.1", port, b"HEAD / HTTP/1.0\r\n\r\n", (204,), 2)
+
+    assert asyncio.run(run()) is None
+
+
+def test_raw_probe_times_out_on_silent_server():
+    async def silent(reader, writer):
+        await asyncio.sleep(5)
+
+    async def run():
+        async with fake_server(silent) as port:
+            return await update._raw_probe("127.0.0.1", port, b"HEAD / HTTP/1.0\r\n\r\n", (204,), 0.2)
+
+    assert asyncio.run(run()) is None
+
+
+def test_connect_probe_rejects_non_200(monkeypatch):
+    trust_local_cert(monkeypatch)
+
+    async def run():
+        async with fake_server(replying(b"HTTP/1.1 407 Proxy Authentication Required\r\n\r\n")) as port:
+            return await update.probe_connect_proxy("127.0.0.1", port, 2)
+
+    assert asyncio.run(run()) is None
+
+
+def test_probe_sends_connect_to_https_test_host():
+    seen = []
+
+    async def recorder(reader, writer):
+        seen.append(await reader.readline())
+
+    async def run():
+        async with fake_server(recorder) as port:
+            await update.probe_connect_proxy("127.0.0.1", port, 0.5)
+
+    asyncio.run(run())
+    assert seen == [f"CONNECT {update.CONNECT_HOST}:443 HTTP/1.1\r\n".encode()]